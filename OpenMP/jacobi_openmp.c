@@ -1,7 +1,6 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <math.h>
-#include <windows.h>
 #include <omp.h>
 
 #define MAX_ITER 1000    // Maximum iterations
@@ -60,7 +59,7 @@ int main() {
     // Open the data file
     file = fopen("matrix_data.txt", "r");
     if (file == NULL) {
-        printf("Error opening file 'matrix_data.txt'\n");
+        fprintf(stderr, "Error opening file 'matrix_data.txt'\n");
         return 1;
     }
 
@@ -104,22 +103,17 @@ int main() {
     }
     printf("\n");
 
-    LARGE_INTEGER frequency;
-    LARGE_INTEGER start;
-    LARGE_INTEGER end;
+    double start;
     double time_spent;
 
-    QueryPerformanceFrequency(&frequency);
-
     // Start timing
-    QueryPerformanceCounter(&start);
+    start = omp_get_wtime();
 
     // Solve using Jacobi method
     jacobi(N, A, b, x, &iterations);
 
     // End timing
-    QueryPerformanceCounter(&end);
-    time_spent = (double)(end.QuadPart - start.QuadPart) * 1000.0 / frequency.QuadPart;
+    time_spent = (omp_get_wtime() - start) * 1000.0;
 
     
     printf("Solution (first 5 elements for large matrices):\n");
@@ -128,6 +122,8 @@ int main() {
     }
     printf("\nIterations: %d\n", iterations);
     printf("Execution time: %.6f milliseconds\n", time_spent);
+    // Machine-readable timing consumed by Scripts/bench/runner.py
+    printf("ELAPSED_NS=%lld\n", (long long)(time_spent * 1e6));
 
     // Free allocated memory
     for (int i = 0; i < N; i++) {
@@ -0,0 +1,21 @@
+from .runner import (
+    Backend,
+    BenchConfig,
+    Result,
+    cap_threads,
+    common_parser,
+    config_from_args,
+    run,
+    thread_limit,
+)
+
+__all__ = [
+    "Backend",
+    "BenchConfig",
+    "Result",
+    "cap_threads",
+    "common_parser",
+    "config_from_args",
+    "run",
+    "thread_limit",
+]
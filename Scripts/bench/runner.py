@@ -0,0 +1,624 @@
+"""
+Shared benchmark driver for the Jacobi executables.
+
+run_bench_mpi.py and run_bench_omp.py describe their sweep with a
+BenchConfig and hand it to run(), which owns launching, pinning, timing,
+statistics, reporting and the CSV history for both backends.
+"""
+import argparse
+import csv
+import functools
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
+
+Backend = Literal["mpi", "omp"]
+
+# Discarded runs per configuration, then timed runs reduced to median and IQR
+WARMUPS = 2
+REPEATS = 7
+# Flag configurations whose IQR exceeds this fraction of the median
+NOISE_RATIO = 0.10
+# Flag configurations that got slower than the previous run by more than this
+REGRESSION_RATIO = 0.05
+RED = "\033[31m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+RESET = "\033[0m"
+
+# Timing line printed by jacobi_mpi.c (rank 0) and jacobi_openmp.c around the solve
+ELAPSED_RE = re.compile(r"ELAPSED_NS=(\d+)")
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# mpi4py worker that calls the kernel repeatedly under a single MPI_Init (BenchConfig.lib)
+WORKER = os.path.join(SCRIPTS_DIR, "jacobi_mpi_worker.py")
+
+# mpiexec options binding each rank to a core, per MPI implementation
+MPI_BINDING = {
+    "openmpi": ["--bind-to", "core", "--map-by", "socket"],
+    "mpich": ["-bind-to", "core", "-map-by", "socket"],
+    "msmpi": ["-affinity"],
+}
+
+# Columns of the history CSV; every run appends one row per configuration.
+# `mode` records how the run was measured (see run_mode); runs are only
+# compared with earlier runs of the same mode.
+CSV_FIELDS = ["timestamp", "commit", "mode", "n", "time_ms", "iqr_ms", "speedup"]
+
+# What a configuration count means for each backend
+LABELS = {"mpi": "processes", "omp": "threads"}
+TITLES = {"mpi": "MPI JACOBI BENCHMARK RESULTS", "omp": "OPENMP JACOBI BENCHMARK RESULTS"}
+
+
+@dataclass
+class BenchConfig:
+    """Description of one benchmark sweep."""
+    backend: Backend
+    # Thread counts (omp) or rank counts (mpi), in reporting order
+    counts: List[int]
+    exe: str
+    # Directory the executable runs in (it reads matrix_data.txt); None keeps the cwd
+    workdir: Optional[str] = None
+    warmups: int = WARMUPS
+    repeats: int = REPEATS
+    pin: bool = True
+    parallel: bool = False
+    # Parse ELAPSED_NS from the child; otherwise time whole launches with output discarded
+    capture: bool = True
+    # mpi only: shared-library kernel for the persistent mpi4py worker (requires capture)
+    lib: Optional[str] = None
+    # Speedup baseline in ms; None uses the time of the first count
+    serial_ms: Optional[float] = None
+    # History CSV to compare against and append to; None disables it
+    csv_path: Optional[str] = None
+    # CPUs the concurrent group of a --parallel sweep may occupy in total;
+    # None uses every logical CPU
+    cpu_budget: Optional[int] = None
+
+
+@dataclass(slots=True)
+class Result:
+    """Outcome of benchmarking one configuration; ms is None when the run failed."""
+    n: int
+    ms: Optional[float]
+    iqr_ms: Optional[float] = None
+    err: Optional[str] = None
+
+
+def parse_elapsed(stdout: Optional[str]) -> Optional[float]:
+    """Return the ELAPSED_NS value reported by the child in ms, or None if absent."""
+    m = ELAPSED_RE.search(stdout or "")
+    return int(m.group(1)) / 1e6 if m else None
+
+
+def median_iqr(samples: List[float]) -> Tuple[float, float]:
+    """Return (median, interquartile range) of samples."""
+    med = statistics.median(samples)
+    if len(samples) < 2:
+        return med, 0.0
+    q1, _, q3 = statistics.quantiles(samples, n=4)
+    return med, q3 - q1
+
+
+def is_noisy(med: float, iqr: float) -> bool:
+    """True when the spread is large enough (IQR > 10% of median) to distrust the figure."""
+    return iqr > NOISE_RATIO * med
+
+
+def partition_counts(counts: List[int], cpus: int) -> Tuple[List[int], List[int]]:
+    """
+    Split counts into (concurrent, alone): the leading counts whose sum fits in
+    `cpus` can share the machine, the rest must run one at a time.
+    """
+    concurrent: List[int] = []
+    used = 0
+    for i, n in enumerate(counts):
+        if used + n > cpus:
+            return concurrent, counts[i:]
+        concurrent.append(n)
+        used += n
+    return concurrent, []
+
+
+def thread_limit(cpus: int) -> int:
+    """Threads a job may use while leaving two hardware threads for the OS."""
+    return max(1, cpus - 2)
+
+
+def cap_threads(threads_list: List[int], cpus: int) -> List[int]:
+    """Clamp thread counts to leave two hardware threads for the OS, dropping duplicates."""
+    limit = thread_limit(cpus)
+    capped: List[int] = []
+    for t in threads_list:
+        t = min(t, limit)
+        if t not in capped:
+            capped.append(t)
+    return capped
+
+
+def launch(cmd: List[str], capture: bool, env: Optional[Dict[str, str]] = None,
+           cwd: Optional[str] = None) -> Optional[str]:
+    """
+    Run cmd to completion. With `capture`, return its stdout for parsing;
+    otherwise discard it (no pipe, no copies into Python). stderr is always
+    inherited so a failing launch still shows its diagnostics.
+    """
+    if capture:
+        return subprocess.run(cmd, check=True, env=env, cwd=cwd,
+                              stdout=subprocess.PIPE, text=True).stdout
+    subprocess.run(cmd, check=True, env=env, cwd=cwd, stdout=subprocess.DEVNULL)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def detect_mpi() -> Optional[str]:
+    """Identify the MPI implementation behind mpiexec ("openmpi", "mpich", "msmpi") or None."""
+    try:
+        proc = subprocess.run(["mpiexec", "--version"], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    vers = proc.stdout + proc.stderr
+    if "Open MPI" in vers or "OpenRTE" in vers:
+        return "openmpi"
+    if "MPICH" in vers or "HYDRA" in vers:
+        return "mpich"
+    if "Microsoft" in vers:
+        return "msmpi"
+    return None
+
+
+def binding_args(impl: Optional[str], n: int, cores: Optional[List[int]] = None) -> List[str]:
+    """
+    mpiexec options pinning n ranks to cores, optionally restricted to `cores`.
+    Returns [] when pinning is off (impl None), unsupported, or would oversubscribe.
+    """
+    if impl is None or n > (os.cpu_count() or 1):
+        return []
+    if cores is None:
+        return list(MPI_BINDING.get(impl, []))
+    cpu_list = ",".join(str(c) for c in cores)
+    if impl == "openmpi":
+        return ["--cpu-set", cpu_list, "--bind-to", "core"]
+    if impl == "mpich":
+        return ["-bind-to", f"user:{cpu_list}"]
+    return []
+
+
+def user_omp_placement() -> bool:
+    """True if the user exported their own OpenMP thread placement, which we never override."""
+    return "OMP_PLACES" in os.environ or "OMP_PROC_BIND" in os.environ
+
+
+def omp_places(first_core: int, n: int) -> Dict[str, str]:
+    """OpenMP settings binding n threads to the logical CPUs first_core .. first_core+n-1."""
+    # "{c}:n" expands to n single-CPU places starting at CPU c
+    return {"OMP_PLACES": f"{{{first_core}}}:{n}", "OMP_PROC_BIND": "close"}
+
+
+def can_pin_disjoint(backend: Backend, impl: Optional[str]) -> bool:
+    """True if concurrent jobs can each be bound to their own set of cores."""
+    if backend == "omp":
+        return not user_omp_placement()
+    return impl in ("openmpi", "mpich")
+
+
+@functools.lru_cache(maxsize=None)
+def git_commit() -> str:
+    """Short hash of the checked-out commit of this repository, or "unknown"."""
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    except OSError:
+        return "unknown"
+    return proc.stdout.strip() if proc.returncode == 0 else "unknown"
+
+
+def make_env(cfg: BenchConfig) -> Optional[Dict[str, str]]:
+    """
+    Build the environment shared by every launch of the sweep, or None to
+    inherit ours unchanged. Copied from os.environ once; measure() only
+    updates OMP_NUM_THREADS.
+    """
+    if cfg.backend != "omp":
+        return None
+    env = os.environ.copy()
+    if cfg.pin:
+        # Keep threads on neighbouring cores instead of letting the OS migrate
+        # them across sockets; user-provided settings win
+        env.setdefault("OMP_PROC_BIND", "close")
+        env.setdefault("OMP_PLACES", "cores")
+        env.setdefault("OMP_DYNAMIC", "false")
+    return env
+
+
+def build_cmd(cfg: BenchConfig, n: int, binding: Sequence[str] = ()) -> List[str]:
+    """Command line that runs the kernel once at count n (and the repeats, if persistent)."""
+    if cfg.backend == "omp":
+        return [cfg.exe]
+    if cfg.lib is not None:
+        return ["mpiexec", *binding, "-n", str(n), sys.executable, WORKER,
+                "--lib", cfg.lib, "--runs", str(cfg.warmups + cfg.repeats)]
+    # Windows PowerShell expects ".\\" for local executable
+    return ["mpiexec", *binding, "-n", str(n), cfg.exe]
+
+
+def measure(cfg: BenchConfig, n: int, env: Optional[Dict[str, str]] = None,
+            binding: Sequence[str] = ()) -> Result:
+    """
+    Benchmark a single configuration: cfg.warmups discarded launches, then
+    cfg.repeats timed ones. With cfg.capture the in-process ELAPSED_NS figure
+    is used when printed; otherwise the launch is timed from the outside.
+    With cfg.lib (mpi), one persistent launch performs every solve instead,
+    so MPI start-up is paid once per count.
+    """
+    cmd = build_cmd(cfg, n, binding)
+    if env is not None:
+        env["OMP_NUM_THREADS"] = str(n)
+    try:
+        if cfg.backend == "mpi" and cfg.lib is not None:
+            stdout = launch(cmd, True, env, cfg.workdir)
+            samples = [int(ns) / 1e6 for ns in ELAPSED_RE.findall(stdout)][cfg.warmups:]
+        else:
+            for _ in range(cfg.warmups):
+                launch(cmd, False, env, cfg.workdir)
+            samples = []
+            for _ in range(cfg.repeats):
+                start_ns = time.perf_counter_ns()
+                stdout = launch(cmd, cfg.capture, env, cfg.workdir)
+                wall_ms = (time.perf_counter_ns() - start_ns) / 1e6
+                elapsed_ms = parse_elapsed(stdout) if cfg.capture else None
+                samples.append(wall_ms if elapsed_ms is None else elapsed_ms)
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"Command failed for n={n}: {e}")
+        return Result(n, None, err=str(e))
+    if not samples:
+        # e.g. the persistent worker printed no more than cfg.warmups timings
+        print(f"No timed samples for n={n}")
+        return Result(n, None, err="no timed samples")
+    med_ms, iqr_ms = median_iqr(samples)
+    return Result(n, med_ms, iqr_ms)
+
+
+def parallel_budget(cfg: BenchConfig) -> int:
+    """CPUs shared by the concurrently running counts of a --parallel sweep."""
+    return cfg.cpu_budget or os.cpu_count() or 1
+
+
+def runs_parallel(cfg: BenchConfig, impl: Optional[str]) -> bool:
+    """True if run_sweep will actually launch several counts of cfg concurrently."""
+    # Concurrent unpinned jobs contend for the same cores; only tolerate
+    # that for single-shot sweeps where the numbers are indicative anyway
+    pinned = cfg.pin and can_pin_disjoint(cfg.backend, impl)
+    if not (cfg.parallel and (cfg.repeats == 1 or pinned)):
+        return False
+    return len(partition_counts(cfg.counts, parallel_budget(cfg))[0]) > 1
+
+
+def bound_counts(cfg: BenchConfig, impl: Optional[str]) -> List[int]:
+    """Counts of cfg whose threads/ranks run_sweep actually binds to cores."""
+    if cfg.backend == "omp":
+        return list(cfg.counts) if cfg.pin else []
+    if impl is None:
+        return []
+    concurrent = (partition_counts(cfg.counts, parallel_budget(cfg))[0]
+                  if runs_parallel(cfg, impl) else [])
+    disjoint = can_pin_disjoint(cfg.backend, impl)
+    # Mirrors run_sweep(): concurrent jobs get a core range, the rest the default binding
+    return [n for n in cfg.counts
+            if (disjoint and binding_args(impl, n, list(range(n))) if n in concurrent
+                else binding_args(impl, n))]
+
+
+def run_mode(cfg: BenchConfig, impl: Optional[str]) -> str:
+    """
+    Describe how cfg is measured, e.g. "elapsed;pinned;serial;w1r7", so the
+    history only compares runs whose timings mean the same thing. When only
+    some counts are bound to cores, they are listed ("pinned:1/2").
+    """
+    bound = bound_counts(cfg, impl)
+    if not bound:
+        pinning = "unpinned"
+    elif len(bound) == len(cfg.counts):
+        pinning = "pinned"
+    else:
+        pinning = "pinned:" + "/".join(str(n) for n in bound)
+    parts = [
+        "persistent" if cfg.lib is not None else "elapsed" if cfg.capture else "wall",
+        pinning,
+        "parallel" if runs_parallel(cfg, impl) else "serial",
+        f"w{cfg.warmups}r{cfg.repeats}",
+    ]
+    return ";".join(parts)
+
+
+def run_sweep(cfg: BenchConfig, impl: Optional[str] = None) -> List[Result]:
+    """
+    Benchmark every count of cfg, returning one Result per count in order.
+    With cfg.parallel, the small counts that fit in the machine together run
+    concurrently, each pinned to its own cores when the backend allows it;
+    the remaining counts run serially afterwards. OpenMP jobs are only pinned
+    to disjoint CPUs when the user has not exported OMP_PLACES/OMP_PROC_BIND.
+    `impl` is the detected MPI implementation used for rank pinning (None
+    disables it).
+    """
+    env = make_env(cfg)
+
+    pinned = cfg.pin and can_pin_disjoint(cfg.backend, impl)
+    parallel = runs_parallel(cfg, impl)
+    if cfg.parallel and not parallel:
+        if cfg.repeats != 1 and not pinned:
+            why = (" (OMP_PLACES/OMP_PROC_BIND set by the user)"
+                   if cfg.backend == "omp" and cfg.pin else "")
+            print(f"--parallel ignored: unpinned jobs{why} need --repeats 1 to run concurrently")
+        else:
+            print("--parallel ignored: only one count fits in the machine at a time")
+
+    concurrent, alone = (
+        partition_counts(cfg.counts, parallel_budget(cfg)) if parallel else ([], cfg.counts)
+    )
+    # Pinned parallel OpenMP sweeps place every job on explicit CPUs, the
+    # serial remainder included, so the whole sweep uses one kind of place
+    explicit_places = parallel and pinned and cfg.backend == "omp"
+    by_count: Dict[int, Result] = {}
+    if parallel:
+        with ProcessPoolExecutor(max_workers=len(concurrent)) as pool:
+            futures = []
+            first_core = 0
+            for n in concurrent:
+                job_env, binding = env, []
+                if explicit_places:
+                    job_env = dict(env, **omp_places(first_core, n))
+                elif pinned:
+                    binding = binding_args(impl, n, list(range(first_core, first_core + n)))
+                futures.append(pool.submit(measure, cfg, n, job_env, binding))
+                first_core += n
+            for fut in futures:
+                res = fut.result()
+                by_count[res.n] = res
+    for n in alone:
+        job_env = dict(env, **omp_places(0, n)) if explicit_places else env
+        by_count[n] = measure(cfg, n, job_env, binding_args(impl, n))
+    return [by_count[n] for n in cfg.counts]
+
+
+def compute_speedups(results: List[Result], serial_ms: Optional[float]) -> Dict[int, float]:
+    """
+    Map each successful count to its speedup over serial_ms. Without a valid
+    baseline (e.g. the first count failed) no speedup is defined: returns {}.
+    """
+    # Validate the baseline once rather than on every row
+    if not (serial_ms and serial_ms > 0):
+        return {}
+    return {
+        r.n: (serial_ms / r.ms if r.ms > 0 else 0.0)
+        for r in results
+        if r.ms is not None
+    }
+
+
+def display_results(cfg: BenchConfig, results: List[Result], speedups: Dict[int, float],
+                    serial_ms: Optional[float]) -> None:
+    """Display benchmark results in a nicely formatted table."""
+    label = LABELS[cfg.backend]
+    # Build the whole table first and emit it with a single write
+    lines = [
+        "",
+        "="*57,
+        TITLES[cfg.backend].center(57).rstrip(),
+        "="*57,
+        # Table header
+        f"{label.capitalize():<10} {'Median (ms)':<12} {'IQR (ms)':<12} {'Speedup':<10}",
+        "-" * 57,
+    ]
+
+    noisy = []
+    for r in results:
+        if r.ms is None:
+            lines.append(f"{r.n:<10} {'ERROR':<12} {'ERROR':<12} {'ERROR':<10}")
+        else:
+            speedup = f"{speedups[r.n]:.2f}" if r.n in speedups else "ERROR"
+            lines.append(f"{r.n:<10} {r.ms:<12.3f} {r.iqr_ms:<12.3f} {speedup:<10}")
+            if is_noisy(r.ms, r.iqr_ms):
+                noisy.append(r.n)
+
+    lines.append("-" * 57)
+    for n in noisy:
+        lines.append(f"{YELLOW}Warning: IQR above {NOISE_RATIO:.0%} of median with {n} {label}; "
+                     f"timing is noisy{RESET}")
+
+    # Summary statistics
+    if serial_ms:
+        lines.append(f"Speedup baseline: {serial_ms:.3f} ms")
+    else:
+        lines.append(f"{YELLOW}No valid speedup baseline; speedups not computed{RESET}")
+    if len(speedups) > 1:
+        best_n, best_speedup = max(speedups.items(), key=lambda kv: kv[1])
+        lines.append(f"Best speedup: {best_speedup:.2f}x with {best_n} {label}")
+
+    lines.append("="*57 + "\n\n")
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.flush()
+
+
+def load_last_run(path: str, mode: str) -> Dict[int, float]:
+    """
+    Return {count: time_ms} for the most recent run of the given mode recorded
+    in the history CSV. Failed rows, missing files and old-format files give
+    no entries.
+    """
+    try:
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames != CSV_FIELDS:
+                return {}
+            rows = [row for row in reader if row["mode"] == mode]
+    except FileNotFoundError:
+        return {}
+    if not rows:
+        return {}
+    last = rows[-1]["timestamp"]
+    prev: Dict[int, float] = {}
+    for row in rows:
+        if row["timestamp"] != last:
+            continue
+        try:
+            prev[int(row["n"])] = float(row["time_ms"])
+        except ValueError:
+            continue  # ERROR row
+    return prev
+
+
+def compare_with_previous(cfg: BenchConfig, results: List[Result], prev: Dict[int, float],
+                          mode: str) -> None:
+    """Print the change against the previous run of `mode` per count, highlighting regressions."""
+    label = LABELS[cfg.backend]
+    lines = [f"Change vs previous run ({mode}):"]
+    for r in results:
+        old = prev.get(r.n)
+        if r.ms is None or not old:
+            continue
+        delta = (r.ms - old) / old
+        color = RED if delta > REGRESSION_RATIO else GREEN if delta < -REGRESSION_RATIO else ""
+        note = "  REGRESSION" if delta > REGRESSION_RATIO else ""
+        lines.append(f"  {r.n:<4} {label}: {old:10.3f} -> {r.ms:10.3f} ms "
+                     f"{color}{delta:+7.1%}{note}{RESET if color else ''}")
+    if len(lines) > 1:
+        sys.stdout.write("\n".join(lines) + "\n\n")
+        sys.stdout.flush()
+
+
+def append_results(path: str, results: List[Result], speedups: Dict[int, float],
+                   mode: str) -> None:
+    """Append this run to the history CSV, tagged with a timestamp, the git commit and its mode."""
+    # A file with a different header predates the history format; keep it aside
+    if os.path.exists(path):
+        with open(path, newline="") as f:
+            header = next(csv.reader(f), None)
+        if header is not None and header != CSV_FIELDS:
+            os.replace(path, path + ".old")
+            print(f"Existing {path} has an older format; moved it to {path}.old")
+
+    stamp = datetime.now().isoformat(timespec="seconds")
+    commit = git_commit()
+    rows = [] if os.path.exists(path) and os.path.getsize(path) else [",".join(CSV_FIELDS)]
+    for r in results:
+        if r.ms is not None:
+            speedup = f"{speedups[r.n]:.3f}" if r.n in speedups else "ERROR"
+            rows.append(f"{stamp},{commit},{mode},{r.n},{r.ms:.3f},{r.iqr_ms:.3f},{speedup}")
+        else:
+            rows.append(f"{stamp},{commit},{mode},{r.n},ERROR,ERROR,ERROR")
+    with open(path, "a", newline="", buffering=1 << 16) as f:
+        f.write("\n".join(rows) + "\n")
+
+
+def int_at_least(minimum: int, value: str) -> int:
+    """Parse value as an int no smaller than minimum, for argparse `type=`."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if n < minimum:
+        raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {n}")
+    return n
+
+
+def positive_int(value: str) -> int:
+    """argparse type for options that need at least one iteration."""
+    return int_at_least(1, value)
+
+
+def non_negative_int(value: str) -> int:
+    """argparse type for counts that may be zero, such as --warmups."""
+    return int_at_least(0, value)
+
+
+def common_parser(description: str, label: str, warmups: int = WARMUPS,
+                  repeats: int = REPEATS) -> argparse.ArgumentParser:
+    """Argument parser with the options every driver shares; `label` names one count."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--warmups", type=non_negative_int, default=warmups,
+                        help=f"discarded runs per {label}")
+    parser.add_argument("--repeats", type=positive_int, default=repeats,
+                        help=f"timed runs per {label}")
+    parser.add_argument("--parallel", action="store_true",
+                        help="run counts that fit in the machine concurrently, each pinned "
+                             "to disjoint cores (unpinned, only honoured with --repeats 1)")
+    parser.add_argument("--no-pin", action="store_true",
+                        help="do not bind threads/ranks to cores")
+    parser.add_argument("--wall-clock", action="store_true",
+                        help="time whole launches and discard child output "
+                             "instead of parsing ELAPSED_NS")
+    return parser
+
+
+def config_from_args(args: argparse.Namespace, backend: Backend, counts: List[int],
+                     exe: str, **kwargs) -> BenchConfig:
+    """BenchConfig for the options added by common_parser; kwargs set the remaining fields."""
+    return BenchConfig(
+        backend=backend,
+        counts=counts,
+        exe=exe,
+        warmups=args.warmups,
+        repeats=args.repeats,
+        pin=not args.no_pin,
+        parallel=args.parallel,
+        capture=not args.wall_clock,
+        **kwargs,
+    )
+
+
+def run(cfg: BenchConfig) -> List[Result]:
+    """Run the sweep described by cfg, report it and record it; returns the results."""
+    if cfg.lib is not None and not cfg.capture:
+        raise ValueError("persistent mode reports ELAPSED_NS only; it cannot time whole launches")
+    if cfg.warmups < 0 or cfg.repeats < 1:
+        raise ValueError(f"need warmups >= 0 and repeats >= 1, got {cfg.warmups} and {cfg.repeats}")
+    impl = detect_mpi() if cfg.backend == "mpi" and cfg.pin else None
+
+    print(f"Running {cfg.backend.upper()} benchmark with executable: {cfg.exe}")
+    print(f"{LABELS[cfg.backend].capitalize()}: {cfg.counts}")
+    if impl is not None:
+        # binding_args() leaves counts that would oversubscribe the machine unbound
+        pinned = bound_counts(cfg, impl)
+        unpinned = [n for n in cfg.counts if n not in pinned]
+        if pinned:
+            print(f"Pinning ranks for {pinned} {LABELS[cfg.backend]} with {impl} options: "
+                  f"{' '.join(MPI_BINDING[impl])}")
+        if unpinned:
+            print(f"Not pinning {unpinned} {LABELS[cfg.backend]}: mpiexec cannot bind them "
+                  f"without oversubscribing the {os.cpu_count() or 1} CPUs")
+    elif cfg.backend == "mpi" and cfg.pin:
+        print("Not pinning ranks: unrecognised or missing mpiexec")
+    if cfg.lib is not None:
+        print(f"Persistent mode with library: {cfg.lib}")
+    print(f"Warmups: {cfg.warmups}, timed repeats: {cfg.repeats}")
+    print("\nStarting benchmark...")
+
+    # Previous run measured the same way, for regression detection once the sweep finishes
+    mode = run_mode(cfg, impl)
+    prev = load_last_run(cfg.csv_path, mode) if cfg.csv_path else {}
+
+    results = run_sweep(cfg, impl)
+
+    # Use first result as baseline if no serial time provided
+    serial_ms = cfg.serial_ms
+    if serial_ms is None and results:
+        serial_ms = results[0].ms
+    speedups = compute_speedups(results, serial_ms)
+
+    # Display results nicely
+    display_results(cfg, results, speedups, serial_ms)
+
+    # Also append to the CSV history for further analysis
+    if cfg.csv_path:
+        compare_with_previous(cfg, results, prev, mode)
+        append_results(cfg.csv_path, results, speedups, mode)
+        print(f"Results appended to {cfg.csv_path} (commit {git_commit()})")
+    return results
@@ -0,0 +1,40 @@
+"""
+Persistent MPI worker used by `run_bench_mpi.py --persistent`.
+
+Launched once per process count as
+    mpiexec -n N python jacobi_mpi_worker.py --lib ./libjacobi_mpi.so --runs K
+it initialises MPI a single time (through mpi4py) and calls the
+jacobi_mpi_run() entry point of the shared-library build of jacobi_mpi.c
+K times, so MPI start-up is paid once instead of once per measurement.
+Rank 0 prints one ELAPSED_NS=<ns> line per run.
+"""
+import argparse
+import ctypes
+import sys
+
+from mpi4py import MPI
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Jacobi MPI kernel repeatedly.")
+    parser.add_argument("--lib", required=True,
+                        help="shared library built with -DJACOBI_MPI_LIBRARY")
+    parser.add_argument("--runs", type=int, default=1, help="number of solves")
+    args = parser.parse_args()
+
+    comm = MPI.COMM_WORLD
+    lib = ctypes.CDLL(args.lib, mode=ctypes.RTLD_GLOBAL)
+    lib.jacobi_mpi_run.argtypes = [ctypes.c_int, ctypes.POINTER(ctypes.c_longlong)]
+    lib.jacobi_mpi_run.restype = ctypes.c_int
+
+    elapsed_ns = ctypes.c_longlong(0)
+    for _ in range(args.runs):
+        if lib.jacobi_mpi_run(0, ctypes.byref(elapsed_ns)) != 0:
+            comm.Abort(1)
+        if comm.Get_rank() == 0:
+            sys.stdout.write(f"ELAPSED_NS={elapsed_ns.value}\n")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
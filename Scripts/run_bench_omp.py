@@ -1,8 +1,11 @@
+import argparse
+import functools
 import os
 import subprocess
-import time
 import shutil
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+from bench import cap_threads, common_parser, config_from_args, run, thread_limit
 
 # Configuration
 SOURCE = "jacobi_openmp.c"
@@ -14,107 +17,124 @@ SERIAL_MS = 100.0
 # If your program needs input file(s), set them here
 WORKING_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Profile data directory for the two-pass --pgo build (relative to WORKING_DIR)
+PGO_DIR = "pgo"
+
 
+@functools.lru_cache(maxsize=None)
 def which_compiler() -> Tuple[str, List[str]]:
     """Return (compiler_name, flags) for compiling OpenMP on this system.
-    Tries gcc then clang.
+    Tries gcc then clang. The result is cached; callers must not mutate the flags.
     """
     if shutil.which("gcc"):
-        return ("gcc", ["-O3", "-fopenmp"])
+        return ("gcc", [
+            "-O3", "-fopenmp", "-march=native", "-ffast-math", "-funroll-loops",
+            "-flto=auto", "-fno-math-errno", "-fno-trapping-math",
+        ])
     if shutil.which("clang"):
         # Windows clang may require -Xpreprocessor -fopenmp and linking to libomp
         # Try the simpler variant first (works on many setups)
-        return ("clang", ["-O3", "-fopenmp"])
+        return ("clang", [
+            "-O3", "-fopenmp", "-march=native", "-ffast-math", "-funroll-loops",
+            "-flto", "-fno-math-errno",
+        ])
     return ("", [])
 
 
-def compile_program() -> None:
+def diag_flags(comp: str) -> List[str]:
+    """Flags that report loops the compiler failed to vectorize."""
+    if comp == "gcc":
+        return ["-fopt-info-vec-missed"]
+    return ["-Rpass-missed=loop-vectorize"]
+
+
+def compile_program(extra_flags: Optional[List[str]] = None) -> None:
     comp, flags = which_compiler()
     if not comp:
         raise RuntimeError(
             "No C compiler found. Install MinGW-w64 (gcc) or LLVM clang."
         )
 
-    cmd = [comp, SOURCE, "-o", EXE] + flags
+    cmd = [comp, SOURCE, "-o", EXE] + flags + (extra_flags or [])
     print(f"Compiling: {' '.join(cmd)}")
     subprocess.run(cmd, cwd=WORKING_DIR, check=True)
 
 
-def run_once(threads: int) -> float:
-    """Run the program with given threads and return elapsed time in ms."""
-    env = os.environ.copy()
-    env["OMP_NUM_THREADS"] = str(threads)
-
-    start = time.perf_counter()
-    proc = subprocess.run([os.path.join(WORKING_DIR, EXE)], cwd=WORKING_DIR, env=env)
-    end = time.perf_counter()
-
-    # If the program prints its own timing, we ignore and measure externally
-    elapsed_ms = (end - start) * 1000.0
-    return elapsed_ms
-
-
-def format_row(cols: List[str], widths: List[int]) -> str:
-    return " | ".join(c.ljust(w) for c, w in zip(cols, widths))
+def compile_pgo(extra_flags: Optional[List[str]] = None) -> None:
+    """Two-pass profile-guided build: instrument, train once, rebuild with the profile."""
+    comp, _ = which_compiler()
+    if comp != "gcc":
+        # clang needs an llvm-profdata merge step between the passes
+        print("PGO is only wired up for gcc; doing a regular build instead")
+        compile_program(extra_flags)
+        return
+
+    extra_flags = extra_flags or []
+    compile_program(extra_flags + [f"-fprofile-generate={PGO_DIR}"])
+    print("Training run for PGO...")
+    subprocess.run(
+        [os.path.join(WORKING_DIR, EXE)],
+        cwd=WORKING_DIR,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    # -fprofile-correction tolerates the racy counters of a multithreaded run
+    compile_program(extra_flags + [f"-fprofile-use={PGO_DIR}", "-fprofile-correction"])
 
 
-def main():
-    # Compile if the executable is missing or older than source
+def build_if_needed(args: argparse.Namespace) -> bool:
+    """Compile if the executable is missing or older than source; False if that failed."""
     exe_path = os.path.join(WORKING_DIR, EXE)
     src_path = os.path.join(WORKING_DIR, SOURCE)
 
-    needs_build = (
-        not os.path.exists(exe_path)
-        or (os.path.getmtime(exe_path) < os.path.getmtime(src_path))
-    )
+    # One stat() per file: a missing executable always needs building
+    try:
+        exe_mtime = os.stat(exe_path).st_mtime
+    except FileNotFoundError:
+        needs_build = True
+    else:
+        needs_build = args.pgo or args.diag or exe_mtime < os.stat(src_path).st_mtime
 
     if needs_build:
         try:
-            compile_program()
+            extra = diag_flags(which_compiler()[0]) if args.diag else []
+            if args.pgo:
+                compile_pgo(extra)
+            else:
+                compile_program(extra)
         except Exception as e:
             print("Compilation failed:", e)
             print(
                 "Hint: On Windows, install MinGW-w64 and ensure 'gcc' is in PATH, "
                 "or install LLVM + OpenMP support."
             )
-            return
-
-    results: List[Tuple[int, float, float]] = []
-
-    print("Running benchmarks...")
-    for t in THREADS:
-        # Warm-up run (optional): helps stabilize timing
-        _ = run_once(t)
-        # Timed run
-        elapsed_ms = run_once(t)
-        speedup = SERIAL_MS / elapsed_ms if elapsed_ms > 0 else float('inf')
-        results.append((t, elapsed_ms, speedup))
-
-    # Prepare table
-    headers = ["Threads", "Time (ms)", f"Speedup vs {SERIAL_MS:.0f} ms"]
-    rows = [
-        [str(t), f"{time_ms:.2f}", f"{sp:.2f}x"]
-        for (t, time_ms, sp) in results
-    ]
-
-    # Compute column widths
-    widths = [
-        max(len(h), *(len(r[i]) for r in rows))
-        for i, h in enumerate(headers)
-    ]
-
-    sep = "-+-".join("-" * w for w in widths)
-
-    print()
-    print(format_row(headers, widths))
-    print(sep)
-    for r in rows:
-        print(format_row(r, widths))
-
-    # Optional: overall best
-    best = min(results, key=lambda x: x[1])
-    print()
-    print(f"Best time: {best[1]:.2f} ms with {best[0]} threads ({SERIAL_MS/best[1]:.2f}x speedup)")
+            return False
+    return True
+
+
+def main():
+    parser = common_parser("Benchmark jacobi_openmp across thread counts.", "thread count")
+    parser.add_argument("--all-threads", action="store_true",
+                        help="run every THREADS entry, even ones exceeding the hardware threads")
+    parser.add_argument("--pgo", action="store_true",
+                        help="rebuild with a two-pass profile-guided optimisation")
+    parser.add_argument("--diag", action="store_true",
+                        help="rebuild and report loops the compiler did not vectorize")
+    args = parser.parse_args()
+
+    if not build_if_needed(args):
+        return
+
+    cpus = os.cpu_count() or 1
+    threads_list = THREADS if args.all_threads else cap_threads(THREADS, cpus)
+    if threads_list != THREADS:
+        print(f"Thread counts capped to {threads_list} ({cpus} hardware threads)")
+
+    # --parallel keeps the same two-thread reserve across all concurrent jobs
+    run(config_from_args(args, "omp", threads_list, os.path.join(WORKING_DIR, EXE),
+                         workdir=WORKING_DIR, serial_ms=SERIAL_MS,
+                         csv_path="benchmark_results_omp.csv",
+                         cpu_budget=None if args.all_threads else thread_limit(cpus)))
 
 
 if __name__ == "__main__":